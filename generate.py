@@ -3,23 +3,27 @@ import hashlib
 import os
 import re
 import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from heapq import merge
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
 
-import pytz
 import json
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from bs4 import BeautifulSoup
-from icalendar import Calendar, Event
+import lxml.html
 from dateutil import parser as dateparser
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DIST_DIR = os.path.join(BASE_DIR, "dist")
 
-TZ = pytz.timezone("Europe/Prague")
+TZ = ZoneInfo("Europe/Prague")
 YEAR = 2026
 
 TEAM_CZ = "CZE"
@@ -131,6 +135,41 @@ PLAYOFF_PHASES = {"quarterfinals", "semifinals", "bronze", "gold"}
 GENDER_EMOJI = {"women": "👩", "men": "👨"}
 MEDAL_EMOJI = {"bronze": "🥉", "gold": "🥇"}
 
+TEAM_LABELS = {
+    code: f"{TEAM_FLAGS[code]} {name}" if code in TEAM_FLAGS else name for code, name in TEAM_NAMES_CZ.items()
+}
+TEAM_LABELS["TBD"] = "TBD 🏒"
+
+# Shared code objects so parsed rows don't each carry their own "CZE" copy.
+_CODE_INTERN = {code: sys.intern(code) for code in [*TEAM_NAMES_CZ, "TBD"]}
+
+_RE_TIME = re.compile(r"\b(\d{1,2}:\d{2})\b")
+_RE_TIME_LINE = re.compile(r"\d{1,2}:\d{2}")
+_RE_DATE = re.compile(r"\b(\d{1,2}\s+[A-Za-z]+\s+20\d{2})\b")
+_RE_VEVENT_DATE = re.compile(r"(\d{1,2}\s+[A-Za-z]+\s+2026)")
+_RE_WIKITEXT_DATE = re.compile(r"(\d{1,2}\s+February\s+2026)")
+_RE_DAY_MONTH_YEAR = re.compile(r"(\d{1,2})\s+([A-Za-z]{3})[A-Za-z]*\s+(20\d{2})")
+_RE_SCORE = re.compile(r"(\d+)\s*[–-]\s*(\d+)")
+_RE_GROUP = re.compile(r"Group\s+([A-Z])")
+_RE_GROUP_LINE = re.compile(r"\bGroup\s+([A-Z])\b")
+_RE_TEAMS_VS = re.compile(r"\b([A-Z]{3}|TBD)\s+vs\s+([A-Z]{3}|TBD)\b")
+_RE_CODE3 = re.compile(r"\b([A-Z]{3})\b")
+_RE_BRACKETS = re.compile(r"\[.*?\]")
+_RE_SHOOTOUT = re.compile(r"GWS|SO", re.IGNORECASE)
+_RE_OVERTIME = re.compile(r"OT", re.IGNORECASE)
+_RE_WIKI_TITLE = re.compile(r"/wiki/([^#?]+)")
+_RE_FLAG = re.compile(r"\{\{flag(?:icon|country)?\|([^}|]+)")
+
+# Longest names first so "united states of america" wins over "united states".
+_RE_TEAM_NAMES = re.compile(
+    "|".join(re.escape(name) for name in sorted(TEAM_ALIAS_LOOKUP, key=len, reverse=True) + ["tbd"])
+)
+
+_XPATH_VEVENT_SUMMARY = (
+    "//table[contains(concat(' ', normalize-space(@class), ' '), ' vevent ')]"
+    "//tr[contains(concat(' ', normalize-space(@class), ' '), ' summary ')]"
+)
+
 
 @dataclass
 class Game:
@@ -171,6 +210,7 @@ def build_session() -> requests.Session:
 
 SESSION = build_session()
 
+@lru_cache(maxsize=None)
 def fetch_url(url: str, timeout: int = 30) -> str:
     log(f"Fetching {url}")
     headers = {
@@ -187,24 +227,62 @@ def fetch_url(url: str, timeout: int = 30) -> str:
 def normalize_team(code: str) -> str:
     if not code:
         return "TBD"
-    return code.strip().upper()
+    code = code.strip().upper()
+    return _CODE_INTERN.get(code, code)
 
 
 def normalize_team_name(name: str) -> str:
     if not name:
         return "TBD"
-    cleaned = re.sub(r"\s+", " ", re.sub(r"\[.*?\]", "", name)).strip()
+    if "[" in name:
+        name = _RE_BRACKETS.sub("", name)
+    cleaned = " ".join(name.split())
     if not cleaned:
         return "TBD"
     alias = TEAM_ALIAS_LOOKUP.get(cleaned.lower())
     if alias:
         return alias
-    m = re.search(r"\b([A-Z]{3})\b", cleaned)
+    m = _RE_CODE3.search(cleaned)
     if m:
-        return m.group(1)
+        return _CODE_INTERN.get(m.group(1), m.group(1))
     return "TBD"
 
 
+def _text(el) -> str:
+    # Join text nodes with a space like get_text(" ", strip=True) did, so
+    # "<a>Fiera Milano</a>, Milan" and "date<br>time" keep their boundaries;
+    # inline <style>/<script> (e.g. flagicon TemplateStyles) is skipped.
+    strings = el.xpath(".//text()[not(ancestor::style) and not(ancestor::script)]")
+    return " ".join(" ".join(strings).split())
+
+
+def _parse_wiki_date(text: str) -> Optional[datetime]:
+    m = _RE_DAY_MONTH_YEAR.search(text)
+    if m:
+        month = MONTHS.get(m.group(2).lower())
+        if month:
+            try:
+                return datetime(int(m.group(3)), month, int(m.group(1)))
+            except ValueError:
+                return None
+    # Anything that is not "D Month YYYY" goes through the slow fuzzy parser.
+    try:
+        dt = dateparser.parse(text, dayfirst=True, fuzzy=True)
+    except (ValueError, TypeError, OverflowError):
+        return None
+    if dt and dt.year == 1900:
+        dt = dt.replace(year=YEAR)
+    return dt
+
+
+def _local_start(day: datetime, time_str: str) -> Optional[datetime]:
+    hour, minute = map(int, time_str.split(":"))
+    try:
+        return datetime(day.year, day.month, day.day, hour, minute, tzinfo=TZ)
+    except ValueError:
+        return None
+
+
 def parse_game_text(game_text: str) -> Tuple[str, str, Optional[str], Optional[str]]:
     phase_key = "preliminary"
     phase_label = "Preliminary Round"
@@ -226,11 +304,11 @@ def parse_game_text(game_text: str) -> Tuple[str, str, Optional[str], Optional[s
         phase_key = "gold"
         phase_label = "Gold Medal Game"
 
-    m_group = re.search(r"Group\s+([A-Z])", game_text)
+    m_group = _RE_GROUP.search(game_text)
     if m_group:
         group_label = f"Skupina {m_group.group(1)}"
 
-    m_teams = re.search(r"\b([A-Z]{3}|TBD)\s+vs\s+([A-Z]{3}|TBD)\b", game_text)
+    m_teams = _RE_TEAMS_VS.search(game_text)
     if m_teams:
         team1 = normalize_team(m_teams.group(1))
         team2 = normalize_team(m_teams.group(2))
@@ -244,18 +322,18 @@ def parse_game_text(game_text: str) -> Tuple[str, str, Optional[str], Optional[s
 
 def parse_wikipedia_schedule(url: str, category: str) -> List[Game]:
     html = fetch_url(url)
-    soup = BeautifulSoup(html, "lxml")
-    tables = soup.find_all("table", class_=re.compile(r"wikitable"))
+    tree = lxml.html.fromstring(html)
+    tables = tree.xpath("//table[contains(@class, 'wikitable')]")
     games: List[Game] = []
 
     for table in tables:
         caption_text = ""
-        caption = table.find("caption")
-        if caption:
-            caption_text = caption.get_text(" ", strip=True)
+        caption = table.find(".//caption")
+        if caption is not None:
+            caption_text = _text(caption)
 
-        header_cells = table.find_all("th")
-        header_texts = [h.get_text(" ", strip=True).lower() for h in header_cells]
+        header_cells = table.xpath(".//th")
+        header_texts = [_text(h).lower() for h in header_cells]
         date_idx = time_idx = venue_idx = None
         team1_idx = team2_idx = None
         for idx, h in enumerate(header_texts):
@@ -271,11 +349,11 @@ def parse_wikipedia_schedule(url: str, category: str) -> List[Game]:
                 team2_idx = idx
 
         current_date: Optional[datetime] = None
-        for row in table.find_all("tr"):
-            cells = row.find_all(["th", "td"])
+        for row in table.xpath(".//tr"):
+            cells = row.xpath("./th|./td")
             if not cells:
                 continue
-            texts = [c.get_text(" ", strip=True) for c in cells]
+            texts = [_text(c) for c in cells]
             row_text = " ".join(texts)
             if not row_text or "schedule" in row_text.lower():
                 continue
@@ -287,37 +365,31 @@ def parse_wikipedia_schedule(url: str, category: str) -> List[Game]:
                 if raw_date.strip().lower() in {"date", "datum"}:
                     raw_date = ""
                 if raw_date:
-                    try:
-                        dt = dateparser.parse(raw_date, dayfirst=True, fuzzy=True)
-                    except (ValueError, TypeError):
-                        dt = None
+                    dt = _parse_wiki_date(raw_date)
                     if dt:
-                        if dt.year == 1900:
-                            dt = dt.replace(year=YEAR)
                         current_date = dt
 
-            time_match = re.search(r"\b(\d{1,2}:\d{2})\b", raw_time or row_text)
+            time_match = _RE_TIME.search(raw_time or row_text)
             if not time_match or not current_date:
                 continue
-            time_str = time_match.group(1)
-            dt = dateparser.parse(f"{current_date.date()} {time_str}", fuzzy=True)
-            if not dt:
+            start = _local_start(current_date, time_match.group(1))
+            if not start:
                 continue
-            start = TZ.localize(datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute))
 
             phase_key = "preliminary"
             group_label = None
             phase_text = f"{caption_text} {row_text}"
-            if re.search(r"quarterfinal", phase_text, re.IGNORECASE):
+            phase_lower = phase_text.lower()
+            if "quarterfinal" in phase_lower:
                 phase_key = "quarterfinals"
-            elif re.search(r"semifinal", phase_text, re.IGNORECASE):
+            elif "semifinal" in phase_lower:
                 phase_key = "semifinals"
-            elif re.search(r"bronze", phase_text, re.IGNORECASE):
+            elif "bronze" in phase_lower:
                 phase_key = "bronze"
-            elif re.search(r"gold|final", phase_text, re.IGNORECASE):
+            elif "gold" in phase_lower or "final" in phase_lower:
                 phase_key = "gold"
 
-            m_group = re.search(r"Group\s+([A-Z])", phase_text)
+            m_group = _RE_GROUP.search(phase_text)
             if m_group:
                 group_label = f"Skupina {m_group.group(1)}"
 
@@ -350,138 +422,112 @@ def parse_wikipedia_schedule(url: str, category: str) -> List[Game]:
                 )
             )
 
-    log(f"Wikipedia tables parsed games: {len(games)}")
+    log(f"[{category}] Wikipedia tables parsed games: {len(games)}")
     if games:
         return games
 
-    vevent_games = parse_wikipedia_vevents(html, category)
-    log(f"Wikipedia vevent parsed games: {len(vevent_games)}")
+    vevent_games = parse_wikipedia_vevents(tree, category)
+    log(f"[{category}] Wikipedia vevent parsed games: {len(vevent_games)}")
     if vevent_games:
         return vevent_games
 
-    fallback_games = parse_wikipedia_schedule_text(html, category)
-    log(f"Wikipedia text fallback games: {len(fallback_games)}")
+    fallback_games = parse_wikipedia_schedule_text(tree, category)
+    log(f"[{category}] Wikipedia text fallback games: {len(fallback_games)}")
     if fallback_games:
         return fallback_games
 
     api_games = parse_wikipedia_wikitext(url, category)
-    log(f"Wikipedia wikitext parsed games: {len(api_games)}")
+    log(f"[{category}] Wikipedia wikitext parsed games: {len(api_games)}")
     return api_games
 
 
-def parse_wikipedia_schedule_text(html: str, category: str) -> List[Game]:
-    soup = BeautifulSoup(html, "lxml")
-    for tag in soup(["script", "style"]):
-        tag.decompose()
-    raw_lines = [line.strip() for line in soup.get_text("\n").splitlines()]
-    lines = [re.sub(r"\s+", " ", line) for line in raw_lines if line.strip()]
+def parse_wikipedia_schedule_text(tree: lxml.html.HtmlElement, category: str) -> List[Game]:
+    strings = tree.xpath("//text()[not(ancestor::script) and not(ancestor::style)]")
+    lines = [" ".join(words) for words in map(str.split, "\n".join(strings).splitlines()) if words]
 
-    team_names = sorted(TEAM_ALIAS_LOOKUP.keys(), key=len, reverse=True)
-    team_names += ["tbd"]
-    venues = ["PalaItalia", "Fiera Milano", "PalaItalia Santa Giulia"]
+    venues = [(v, v.lower()) for v in ["PalaItalia", "Fiera Milano", "PalaItalia Santa Giulia"]]
 
     games: List[Game] = []
     current_date: Optional[datetime] = None
-    current_time: Optional[Tuple[int, int]] = None
+    current_time: Optional[str] = None
     current_phase = "preliminary"
     current_group: Optional[str] = None
 
-    i = 0
-    while i < len(lines):
-        line = lines[i]
+    for i, line in enumerate(lines):
+        lower = line.lower()
 
-        if re.search(r"\bGroup\s+[A-Z]\b", line):
-            m = re.search(r"Group\s+([A-Z])", line)
-            if m:
-                current_group = f"Skupina {m.group(1)}"
-                current_phase = "preliminary"
-            i += 1
+        # Cheap substring tests keep the regexes off the vast majority of lines.
+        m = _RE_GROUP_LINE.search(line) if "Group" in line else None
+        if m:
+            current_group = f"Skupina {m.group(1)}"
+            current_phase = "preliminary"
             continue
-        if re.search(r"Quarter-finals|Quarterfinals", line, re.IGNORECASE):
+        if "quarter-finals" in lower or "quarterfinals" in lower:
             current_phase = "quarterfinals"
             current_group = None
-            i += 1
             continue
-        if re.search(r"Semi-finals|Semifinals", line, re.IGNORECASE):
+        if "semi-finals" in lower or "semifinals" in lower:
             current_phase = "semifinals"
             current_group = None
-            i += 1
             continue
-        if re.search(r"Bronze medal game|Bronze", line, re.IGNORECASE):
+        if "bronze" in lower:
             current_phase = "bronze"
             current_group = None
-            i += 1
             continue
-        if re.search(r"Gold medal game|Gold|Final", line, re.IGNORECASE):
+        if "gold" in lower or "final" in lower:
             current_phase = "gold"
             current_group = None
-            i += 1
             continue
 
-        m_date = re.search(r"\b(\d{1,2}\s+[A-Za-z]+\s+20\d{2})\b", line)
+        m_date = _RE_DATE.search(line) if "20" in line else None
         if m_date:
-            try:
-                current_date = dateparser.parse(m_date.group(1), dayfirst=True, fuzzy=True)
-            except (ValueError, TypeError):
-                current_date = None
-            if current_date and current_date.year == 1900:
-                current_date = current_date.replace(year=YEAR)
-            i += 1
+            current_date = _parse_wiki_date(m_date.group(1))
             continue
 
-        m_time = re.fullmatch(r"\d{1,2}:\d{2}", line)
+        m_time = _RE_TIME_LINE.fullmatch(line) if ":" in line else None
         if m_time:
-            parts = m_time.group(0).split(":")
-            current_time = (int(parts[0]), int(parts[1]))
-            i += 1
+            current_time = m_time.group(0)
             continue
 
         if not current_date or not current_time:
-            i += 1
             continue
 
-        lower = line.lower()
         if "attendance" in lower or "goalies" in lower or "referees" in lower or "linesmen" in lower:
-            i += 1
             continue
 
         found = []
-        positions = []
-        for name in team_names:
-            idx = lower.find(name)
-            if idx != -1:
-                found.append(name)
-                positions.append((idx, name))
+        for m_name in _RE_TEAM_NAMES.finditer(lower):
+            if m_name.group(0) not in found:
+                found.append(m_name.group(0))
         if len(found) >= 2 or "tbd v tbd" in lower:
             if "tbd v tbd" in lower:
                 team1 = "TBD"
                 team2 = "TBD"
             else:
-                positions.sort(key=lambda x: x[0])
-                team1 = normalize_team_name(positions[0][1])
-                team2 = normalize_team_name(positions[1][1])
+                team1 = normalize_team_name(found[0])
+                team2 = normalize_team_name(found[1])
 
             score1 = score2 = None
-            m_score = re.search(r"(\d+)\s*[–-]\s*(\d+)", line)
+            m_score = _RE_SCORE.search(line)
             if m_score:
                 score1 = int(m_score.group(1))
                 score2 = int(m_score.group(2))
 
             venue = None
-            for v in venues:
-                if v.lower() in lower:
+            for v, v_lower in venues:
+                if v_lower in lower:
                     venue = v
                     break
             if not venue and i + 1 < len(lines):
-                next_line = lines[i + 1]
-                for v in venues:
-                    if v.lower() in next_line.lower():
+                next_lower = lines[i + 1].lower()
+                for v, v_lower in venues:
+                    if v_lower in next_lower:
                         venue = v
                         break
 
-            start = TZ.localize(
-                datetime(current_date.year, current_date.month, current_date.day, current_time[0], current_time[1])
-            )
+            start = _local_start(current_date, current_time)
+            if not start:
+                continue
             games.append(
                 Game(
                     category=category,
@@ -496,21 +542,18 @@ def parse_wikipedia_schedule_text(html: str, category: str) -> List[Game]:
                     score2=score2,
                 )
             )
-        i += 1
 
     return games
 
 
-def parse_wikipedia_vevents(html: str, category: str) -> List[Game]:
-    soup = BeautifulSoup(html, "lxml")
+def parse_wikipedia_vevents(tree: lxml.html.HtmlElement, category: str) -> List[Game]:
     games: List[Game] = []
 
-    def infer_phase_from_heading(node) -> Tuple[str, Optional[str]]:
-        heading = node.find_previous(["h2", "h3"])
-        if not heading:
+    def infer_phase_from_heading(heading) -> Tuple[str, Optional[str]]:
+        if heading is None:
             return "preliminary", None
         heading_id = (heading.get("id") or "").lower()
-        heading_text = heading.get_text(" ", strip=True).lower()
+        heading_text = _text(heading).lower()
 
         if "group_a" in heading_id or "group a" in heading_text:
             return "preliminary", "Skupina A"
@@ -526,54 +569,60 @@ def parse_wikipedia_vevents(html: str, category: str) -> List[Game]:
             return "gold", None
         return "preliminary", None
 
-    for summary in soup.select("table.vevent tr.summary"):
-        cells = summary.find_all("td")
+    # Headings and summary rows come back in document order, so the current
+    # section is tracked in one pass instead of searching backwards per row.
+    heading = None
+    for summary in tree.xpath(f"//h2|//h3|{_XPATH_VEVENT_SUMMARY}"):
+        if summary.tag in ("h2", "h3"):
+            heading = summary
+            continue
+        cells = summary.xpath(".//td")
         if len(cells) < 4:
             continue
 
-        left_text = " ".join(cells[0].stripped_strings)
-        m_date = re.search(r"(\d{1,2}\s+[A-Za-z]+\s+2026)", left_text)
-        m_time = re.search(r"\b(\d{1,2}:\d{2})\b", left_text)
+        left_text = _text(cells[0])
+        m_date = _RE_VEVENT_DATE.search(left_text)
+        m_time = _RE_TIME.search(left_text)
         if not (m_date and m_time):
             continue
-        try:
-            dt = dateparser.parse(f"{m_date.group(1)} {m_time.group(1)}", dayfirst=True, fuzzy=True)
-        except (ValueError, TypeError):
+        day = _parse_wiki_date(m_date.group(1))
+        start = _local_start(day, m_time.group(1)) if day else None
+        if not start:
             continue
-        start = TZ.localize(datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute))
 
-        team1 = normalize_team_name(cells[1].get_text(" ", strip=True))
-        team2 = normalize_team_name(cells[3].get_text(" ", strip=True))
+        team1 = normalize_team_name(_text(cells[1]))
+        team2 = normalize_team_name(_text(cells[3]))
 
         score1 = score2 = None
         status_suffix = None
-        center_text = cells[2].get_text(" ", strip=True)
-        m_score = re.search(r"(\d+)\s*[–-]\s*(\d+)", center_text)
+        center_text = _text(cells[2])
+        m_score = _RE_SCORE.search(center_text)
         if m_score:
             score1 = int(m_score.group(1))
             score2 = int(m_score.group(2))
-            if re.search(r"GWS|SO", center_text, re.IGNORECASE):
+            if _RE_SHOOTOUT.search(center_text):
                 status_suffix = "SO"
-            elif re.search(r"OT", center_text, re.IGNORECASE):
+            elif _RE_OVERTIME.search(center_text):
                 status_suffix = "OT"
             else:
                 status_suffix = "FT"
 
         venue = None
-        location = cells[4].get_text(" ", strip=True) if len(cells) > 4 else ""
+        location = _text(cells[4]) if len(cells) > 4 else ""
         if location:
             venue = location
 
-        phase_key, group_label = infer_phase_from_heading(summary)
-        anchor_text = cells[0].get_text(" ", strip=True)
-        anchor = cells[0].find("a", href=True)
-        anchor_id = anchor["href"][1:] if anchor and anchor["href"].startswith("#") else ""
+        phase_key, group_label = infer_phase_from_heading(heading)
+        anchor_text = left_text.lower()
+        anchors = cells[0].xpath(".//a[@href]")
+        href = anchors[0].get("href") if anchors else ""
+        anchor_id = href[1:] if href.startswith("#") else ""
         anchor_key = anchor_id.lower()
 
-        if "group_a" in anchor_key or "group a" in anchor_text.lower():
+        if "group_a" in anchor_key or "group a" in anchor_text:
             phase_key = "preliminary"
             group_label = "Skupina A"
-        elif "group_b" in anchor_key or "group b" in anchor_text.lower():
+        elif "group_b" in anchor_key or "group b" in anchor_text:
             phase_key = "preliminary"
             group_label = "Skupina B"
         elif "quarter" in anchor_key:
@@ -609,7 +658,7 @@ def parse_wikipedia_vevents(html: str, category: str) -> List[Game]:
 
 
 def parse_wikipedia_wikitext(url: str, category: str) -> List[Game]:
-    m = re.search(r"/wiki/([^#?]+)", url)
+    m = _RE_WIKI_TITLE.search(url)
     if not m:
         return []
     title = m.group(1)
@@ -633,7 +682,7 @@ def parse_wikipedia_wikitext(url: str, category: str) -> List[Game]:
         nonlocal current_phase, current_group
         if line.startswith("==="):
             if "Group " in line:
-                m_group = re.search(r"Group\s+([A-Z])", line)
+                m_group = _RE_GROUP.search(line)
                 if m_group:
                     current_group = f"Skupina {m_group.group(1)}"
                     current_phase = "preliminary"
@@ -652,10 +701,7 @@ def parse_wikipedia_wikitext(url: str, category: str) -> List[Game]:
                 current_group = None
 
     def extract_teams(row_text: str) -> Tuple[str, str]:
-        teams = []
-        for pattern in [r"\{\{flag\|([^}|]+)", r"\{\{flagicon\|([^}|]+)", r"\{\{flagcountry\|([^}|]+)"]:
-            for m_team in re.finditer(pattern, row_text):
-                teams.append(normalize_team_name(m_team.group(1)))
+        teams = [normalize_team_name(m_team.group(1)) for m_team in _RE_FLAG.finditer(row_text)]
         teams = [t for t in teams if t != "TBD"]
         if len(teams) >= 2:
             return teams[0], teams[1]
@@ -667,29 +713,22 @@ def parse_wikipedia_wikitext(url: str, category: str) -> List[Game]:
         if line.startswith("|-"):
             row_text = " ".join(row_buffer)
             row_buffer = []
-            m_date = re.search(r"(\d{1,2}\s+February\s+2026)", row_text)
+            m_date = _RE_WIKITEXT_DATE.search(row_text)
             if m_date:
-                try:
-                    current_date = dateparser.parse(m_date.group(1), dayfirst=True, fuzzy=True)
-                except (ValueError, TypeError):
-                    current_date = None
-                if current_date and current_date.year == 1900:
-                    current_date = current_date.replace(year=YEAR)
-            m_time = re.search(r"\b(\d{1,2}:\d{2})\b", row_text)
+                current_date = _parse_wiki_date(m_date.group(1))
+            m_time = _RE_TIME.search(row_text)
             if not (current_date and m_time):
                 continue
-            time_str = m_time.group(1)
-            dt = dateparser.parse(f"{current_date.date()} {time_str}", fuzzy=True)
-            if not dt:
+            start = _local_start(current_date, m_time.group(1))
+            if not start:
                 continue
-            start = TZ.localize(datetime(dt.year, dt.month, dt.day, dt.hour, dt.minute))
             team1, team2 = extract_teams(row_text)
             if team1 == "TBD" and team2 == "TBD":
                 continue
 
             score1 = score2 = None
             status_suffix = None
-            m_score = re.search(r"(\d+)\s*[–-]\s*(\d+)", row_text)
+            m_score = _RE_SCORE.search(row_text)
             if m_score:
                 score1 = int(m_score.group(1))
                 score2 = int(m_score.group(2))
@@ -731,17 +770,12 @@ def team_display(code: str) -> str:
     return TEAM_NAMES_CZ.get(code, code)
 
 def team_display_with_flag(code: str) -> str:
-    if code == "TBD":
-        return "TBD 🏒"
-    name = TEAM_NAMES_CZ.get(code, code)
-    flag = TEAM_FLAGS.get(code)
-    if flag:
-        return f"{flag} {name}"
-    return name
+    return TEAM_LABELS.get(code, code)
 
 
-def build_uid(category: str, start: datetime, team1: str, team2: str) -> str:
-    base = f"{category}|{start.strftime('%Y-%m-%d %H:%M')}|{team1}|{team2}"
+@lru_cache(maxsize=512)
+def build_uid(category: str, start_key: str, team1: str, team2: str) -> str:
+    base = f"{category}|{start_key}|{team1}|{team2}"
     return hashlib.sha1(base.encode("utf-8")).hexdigest() + "@zoh-hokej-ics"
 
 
@@ -751,22 +785,32 @@ def should_include(game: Game) -> bool:
     return TEAM_CZ in (game.team1, game.team2)
 
 
-def assign_playoff_indices(games: List[Game]) -> None:
-    counters: Dict[str, int] = {k: 0 for k in PLAYOFF_PHASES}
-    for game in sorted(games, key=lambda g: g.start):
+def select_games(games: List[Game]) -> List[Game]:
+    games.sort(key=attrgetter("start"))
+    counters: Counter = Counter()
+    selected: List[Game] = []
+    for game in games:
         if game.phase_key in PLAYOFF_PHASES:
             counters[game.phase_key] += 1
             game.playoff_index = counters[game.phase_key]
+        if should_include(game):
+            selected.append(game)
+    return selected
 
 
-def build_summary(game: Game) -> str:
-    emoji = GENDER_EMOJI.get(game.category, "")
-    medal = MEDAL_EMOJI.get(game.phase_key, "")
+@lru_cache(maxsize=None)
+def summary_prefix(category: str, phase_key: str) -> str:
+    emoji = GENDER_EMOJI.get(category, "")
+    medal = MEDAL_EMOJI.get(phase_key, "")
     prefix_parts = [p for p in [emoji, medal] if p]
-    prefix = f"{' '.join(prefix_parts)} " if prefix_parts else ""
+    return f"{' '.join(prefix_parts)} " if prefix_parts else ""
+
+
+def build_summary(game: Game) -> str:
+    prefix = summary_prefix(game.category, game.phase_key)
     if game.phase_key in PLAYOFF_PHASES and (game.team1 == "TBD" or game.team2 == "TBD"):
         index = game.playoff_index or 1
-        return f"{prefix}{PHASE_CZ[game.phase_key]} {index}"
+        return f"{prefix}{game.phase_label} {index}"
     t1 = team_display_with_flag(game.team1)
     t2 = team_display_with_flag(game.team2)
     summary = f"{prefix}{t1} – {t2}"
@@ -780,7 +824,7 @@ def build_description(game: Game) -> str:
     if game.group_label:
         parts.append(game.group_label)
     else:
-        parts.append(PHASE_CZ.get(game.phase_key, "Skupina"))
+        parts.append(game.phase_label)
     if game.venue:
         parts.append(game.venue)
     if game.gamecenter:
@@ -788,32 +832,78 @@ def build_description(game: Game) -> str:
     return "\n".join(parts)
 
 
-def games_to_calendar(games: List[Game], cal_name: str) -> Calendar:
-    cal = Calendar()
-    cal.add("prodid", "-//zoh-hokej-2026-ics//CZ")
-    cal.add("version", "2.0")
-    cal.add("x-wr-calname", cal_name)
-    cal.add("x-wr-timezone", "Europe/Prague")
+def ics_escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def ics_fold(line: str, limit: int = 75) -> str:
+    if len(line.encode("utf-8")) < limit:
+        return line
+    parts: List[str] = []
+    current: List[str] = []
+    size = 0
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if current and size + char_size >= limit:
+            # Never split an escape such as "\," across a fold; carry the
+            # backslash (or RFC 6868 "^") into the next segment.
+            if len(current) > 1 and current[-1] in "\\^":
+                carried = current.pop()
+                parts.append("".join(current))
+                current = [carried]
+                size = len(carried)
+            else:
+                parts.append("".join(current))
+                current = []
+                size = 0
+        current.append(char)
+        size += char_size
+    parts.append("".join(current))
+    return "\r\n ".join(parts)
+
+
+def iter_ics_lines(games: Iterable[Game], cal_name: str) -> Iterator[str]:
+    yield "BEGIN:VCALENDAR"
+    yield "VERSION:2.0"
+    yield "PRODID:-//zoh-hokej-2026-ics//CZ"
+    yield ics_fold(f"X-WR-CALNAME:{ics_escape(cal_name)}")
+    yield "X-WR-TIMEZONE:Europe/Prague"
 
     for game in games:
-        event = Event()
-        summary = build_summary(game)
-        event.add("summary", summary)
-        event.add("dtstart", game.start)
-        event.add("dtend", game.start + timedelta(hours=3))
-        event.add("uid", build_uid(game.category, game.start, game.team1, game.team2))
+        end = game.start + timedelta(hours=3)
+        yield "BEGIN:VEVENT"
+        yield ics_fold(f"SUMMARY:{ics_escape(build_summary(game))}")
+        yield f"DTSTART;TZID=Europe/Prague:{game.start.strftime('%Y%m%dT%H%M%S')}"
+        yield f"DTEND;TZID=Europe/Prague:{end.strftime('%Y%m%dT%H%M%S')}"
+        yield f"UID:{build_uid(game.category, game.start.strftime('%Y-%m-%d %H:%M'), game.team1, game.team2)}"
         description = build_description(game)
         if description:
-            event.add("description", description)
-        cal.add_component(event)
+            yield ics_fold(f"DESCRIPTION:{ics_escape(description)}")
+        yield "END:VEVENT"
 
-    return cal
+    yield "END:VCALENDAR"
 
 
-def write_calendar(cal: Calendar, out_path: str) -> None:
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    with open(out_path, "wb") as f:
-        f.write(cal.to_ical())
+def write_calendar(lines: Iterable[str], out_path: str) -> None:
+    # Stream into a sibling temp file and swap it in only once complete, so a
+    # failure mid-calendar never leaves a truncated dist/*.ics behind.
+    tmp_path = f"{out_path}.tmp"
+    try:
+        with open(tmp_path, "wb", buffering=64 * 1024) as f:
+            for line in lines:
+                f.write(line.encode("utf-8"))
+                f.write(b"\r\n")
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
 
 def load_schedule_for_category(cfg: Dict[str, str]) -> List[Game]:
@@ -822,39 +912,38 @@ def load_schedule_for_category(cfg: Dict[str, str]) -> List[Game]:
         if games:
             return games
     except Exception as wiki_exc:
-        log(f"Wikipedia fetch failed ({wiki_exc})")
+        log(f"[{cfg['category']}] Wikipedia fetch failed ({wiki_exc})")
     return []
 
 
 def main() -> int:
     all_games: Dict[str, List[Game]] = {}
+    os.makedirs(DIST_DIR, exist_ok=True)
+
+    # Both pages are independent network fetches; results are consumed in
+    # EVENTS order so the output stays deterministic.
+    with ThreadPoolExecutor(max_workers=len(EVENTS)) as pool:
+        loaded = {key: pool.submit(load_schedule_for_category, cfg) for key, cfg in EVENTS.items()}
 
     for key, cfg in EVENTS.items():
-        games = load_schedule_for_category(cfg)
+        games = loaded[key].result()
         if not games:
             log(f"No games for {key}, skipping")
             all_games[key] = []
             continue
 
-        assign_playoff_indices(games)
-
-        games = [g for g in games if should_include(g)]
-        games.sort(key=lambda g: g.start)
+        games = select_games(games)
         all_games[key] = games
 
-        cal = games_to_calendar(games, f"ZOH 2026 – hokej ({cfg['label']})")
         out_path = os.path.join(DIST_DIR, cfg["out_file"])
-        write_calendar(cal, out_path)
+        write_calendar(iter_ics_lines(games, f"ZOH 2026 – hokej ({cfg['label']})"), out_path)
         log(f"Wrote {out_path}")
 
-    combined = []
-    for games in all_games.values():
-        combined.extend(games)
+    # select_games leaves each category sorted by start, so a merge suffices.
+    combined = list(merge(*all_games.values(), key=attrgetter("start")))
     if combined:
-        combined.sort(key=lambda g: g.start)
-        cal = games_to_calendar(combined, "ZOH 2026 – hokej (Česko)")
         out_path = os.path.join(DIST_DIR, "zoh-2026-hokej-cesko.ics")
-        write_calendar(cal, out_path)
+        write_calendar(iter_ics_lines(combined, "ZOH 2026 – hokej (Česko)"), out_path)
         log(f"Wrote {out_path}")
 
     return 0